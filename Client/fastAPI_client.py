@@ -1,6 +1,6 @@
 import asyncio
 import json
-import base64
+import mmap
 import os
 import sys
 from pathlib import Path
@@ -10,6 +10,20 @@ from typing import Optional
 import websockets
 from websockets.exceptions import ConnectionClosed
 
+# Faster JSON when available, orjson.JSONDecodeError subclasses json.JSONDecodeError
+# JSON always goes out as text frames, binary frames are reserved for document bytes
+try:
+    import orjson
+    def json_dumps(message: dict) -> str:
+        return orjson.dumps(message).decode('utf-8')
+    json_loads = orjson.loads
+except ImportError:
+    json_dumps = json.dumps
+    json_loads = json.loads
+
+# Mirrors MAX_FILE_SIZE_MB in Server/config.py (the client is copied around on its own)
+MAX_FILE_SIZE_MB = 50
+
 
 class VirtualRAGClient:
     """
@@ -24,6 +38,7 @@ class VirtualRAGClient:
         self.running = True
         self.authenticated = False
         self.llm_responding = False  
+        self.flush_task: Optional[asyncio.Task] = None
         self.ready_for_input = asyncio.Event()  
         self.ready_for_input.set()  
     
@@ -31,7 +46,13 @@ class VirtualRAGClient:
         """Establish WebSocket connection to server"""
         try:
             print(f"Connecting to {self.server_url}...")
-            self.websocket = await websockets.connect(self.server_url)
+            # No permessage-deflate: document bytes (PDFs) are already compressed and tiny token frames don't benefit
+            self.websocket = await websockets.connect(
+                self.server_url,
+                compression=None,
+                max_size=64 * 1024 * 1024,
+                write_limit=2 ** 20
+            )
             print("Connected!")
             return True
         except Exception as e:
@@ -49,7 +70,7 @@ class VirtualRAGClient:
         """Send JSON message to server"""
         if self.websocket:
             try:
-                await self.websocket.send(json.dumps(message))
+                await self.websocket.send(json_dumps(message))
             except Exception as e:
                 print(f"Error sending message: {e}")
     
@@ -59,7 +80,7 @@ class VirtualRAGClient:
             while self.running and self.websocket:
                 try:
                     message_str = await self.websocket.recv()
-                    message = json.loads(message_str)
+                    message = json_loads(message_str)
                     await self.handle_server_message(message)
                 except ConnectionClosed:
                     print("\nConnection closed by server")
@@ -93,7 +114,7 @@ class VirtualRAGClient:
             
             if status == "success":
                 print(f"Document: {msg}")
-            elif status == "duplicate":
+            elif status in ("duplicate", "in_progress"):
                 print(f"{msg}")
             else:
                 print(f"Document error: {msg}")
@@ -109,14 +130,19 @@ class VirtualRAGClient:
             self.llm_responding = True
             self.ready_for_input.clear()  # Block input while LLM responds
             print("\nAssistant: ", end="", flush=True)
+            self.flush_task = asyncio.create_task(self.flush_output())
             
         elif msg_type == "llm_chunk":
+            # Buffered write, flush_output pushes it to the terminal periodically
             chunk = message.get("data", "")
-            print(chunk, end="", flush=True)
+            sys.stdout.write(chunk)
             
         elif msg_type == "llm_end":
             self.llm_responding = False  # LLM finished responding
-            print()  # End the assistant's response with newline
+            if self.flush_task:
+                self.flush_task.cancel()
+                self.flush_task = None
+            print(flush=True)  # End the assistant's response with newline
             self.ready_for_input.set()  # Signal ready for next input
             
         elif msg_type == "error":
@@ -126,59 +152,94 @@ class VirtualRAGClient:
             print(f"\n{message.get('message', 'Disconnected')}")
             self.running = False
     
-    def encode_file(self, file_path: str):
+    async def flush_output(self, interval: float = 0.05):
+        """Flush streamed LLM output every interval instead of once per chunk"""
+        while self.llm_responding:
+            await asyncio.sleep(interval)
+            sys.stdout.flush()
+    
+    def validate_file(self, file_path: str):
+        """
+        Check that a file exists and has a supported extension, returning its Path or None
+        """
+        path = Path(file_path)
+        if not path.exists():
+            print(f"File not found: {file_path}")
+            return None
+        
+        # Check file extension
+        if path.suffix.lower() not in ['.pdf', '.txt']:
+            print(f"Unsupported file type: {path.suffix}")
+            return None
+        
+        # Check file size before reading anything
+        size_mb = path.stat().st_size / (1024 * 1024)
+        if size_mb > MAX_FILE_SIZE_MB:
+            print(f"File too large: {path.name} ({size_mb:.1f}MB > {MAX_FILE_SIZE_MB}MB)")
+            return None
+        
+        return path
+    
+    async def iter_file_chunks(self, path: Path, block: int = 1024 * 1024):
+        """
+        Yield a file in blocks as memoryviews over an mmap of it, so blocks
+        come straight from the page cache without being copied into bytes first
+        """
+        if path.stat().st_size == 0:
+            return
+        
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                for start in range(0, len(mm), block):
+                    chunk = view[start:start + block]
+                    try:
+                        yield chunk
+                    finally:
+                        chunk.release()
+            finally:
+                view.release()
+    
+    async def send_document(self, file_path: str):
         """
-        Read and base64 encode a file
+        Stream a document to the server as a doc_start message, binary frames of raw
+        file bytes, then doc_end, so the whole file is never held in memory or base64 encoded
         """
+        path = self.validate_file(file_path)
+        if not path:
+            return False
+        
         try:
-            path = Path(file_path)
-            if not path.exists():
-                print(f"File not found: {file_path}")
-                return None
-            
-            # Check file extension
-            if path.suffix.lower() not in ['.pdf', '.txt']:
-                print(f"Unsupported file type: {path.suffix}")
-                return None
+            await self.send_message({
+                "type": "doc_start",
+                "filename": path.name
+            })
             
-            # Read and encode
-            with open(path, 'rb') as f:
-                content = f.read()
+            async for chunk in self.iter_file_chunks(path):
+                await self.websocket.send(chunk)
             
-            content_b64 = base64.b64encode(content).decode('utf-8')
-            
-            return {
-                "filename": path.name,
-                "content": content_b64
-            }
+            await self.send_message({"type": "doc_end"})
+            return True
             
         except Exception as e:
             print(f"Error reading file {file_path}: {e}")
-            return None
+            return False
     
     async def send_query(self, query: str, file_paths: list = None):
         """
         Send a query with optional document attachments (taking in questions and Optional list of file paths to attach)
+        Attachments are streamed first, the server attaches them to the following query
         """
-        # Prepare message
-        message = {
-            "type": "query",
-            "query": query
-        }
-        
-        # Attach documents if provided
+        # Stream documents if provided
         if file_paths:
-            documents = []
             for file_path in file_paths:
-                encoded = self.encode_file(file_path)
-                if encoded:
-                    documents.append(encoded)
-            
-            if documents:
-                message["documents"] = documents
+                await self.send_document(file_path)
         
-        # Send to server
-        await self.send_message(message)
+        # Send query to server
+        await self.send_message({
+            "type": "query",
+            "query": query
+        })
     
     async def run(self):
         """Main client loop"""
@@ -303,7 +364,21 @@ async def main():
     await client.run()
 
 
+def install_fast_event_loop():
+    """Use uvloop (or winloop on Windows) for the asyncio event loop when installed"""
+    try:
+        if sys.platform == "win32":
+            import winloop
+            winloop.install()
+        else:
+            import uvloop
+            uvloop.install()
+    except ImportError:
+        pass
+
+
 if __name__ == "__main__":
+    install_fast_event_loop()
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
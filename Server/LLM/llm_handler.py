@@ -1,5 +1,6 @@
-import requests
-import json
+import io
+import httpx
+import orjson
 from typing import AsyncGenerator, Dict, Optional
 
 import sys
@@ -20,12 +21,15 @@ class LLMHandler:
         self.temperature = LLM_TEMPERATURE
         self.max_tokens = LLM_MAX_TOKENS
         
+        # Shared async HTTP client so streaming never blocks the event loop
+        self.client = httpx.AsyncClient(timeout=60)
+        
     def is_available(self):
         """
         Check if Ollama server is available returning true if server is responding or false otherwise
         """
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = httpx.get(f"{self.base_url}/api/tags", timeout=5)
             return response.status_code == 200
         except Exception as e:
             print(f"LLM server not available: {e}")
@@ -56,28 +60,27 @@ class LLMHandler:
         
         try:
             # Stream response from Ollama
-            response = requests.post(
+            async with self.client.stream(
+                "POST",
                 f"{self.base_url}/api/generate",
-                json=payload,
-                stream=True,
-                timeout=60
-            )
-            
-            if response.status_code != 200:
-                yield f"Error: LLM returned status {response.status_code}"
-                return
-            
-            # Parse and yield chunks
-            for line in response.iter_lines():
-                if line:
-                    try:
-                        chunk = json.loads(line)
-                        if "response" in chunk:
-                            yield chunk["response"]
-                        if chunk.get("done", False):
-                            break
-                    except json.JSONDecodeError:
-                        continue
+                json=payload
+            ) as response:
+                
+                if response.status_code != 200:
+                    yield f"Error: LLM returned status {response.status_code}"
+                    return
+                
+                # Parse and yield chunks
+                async for line in response.aiter_lines():
+                    if line:
+                        try:
+                            chunk = orjson.loads(line)
+                            if "response" in chunk:
+                                yield chunk["response"]
+                            if chunk.get("done", False):
+                                break
+                        except orjson.JSONDecodeError:
+                            continue
                         
         except Exception as e:
             yield f"Error generating response: {str(e)}"
@@ -91,18 +94,20 @@ class LLMHandler:
         """
         Build the complete prompt adding on context and system message
         """
-        parts = []
+        prompt_builder = io.StringIO()
         
         # Add system message if provided
         if system_message:
-            parts.append(f"System: {system_message}\n")
+            prompt_builder.write(f"System: {system_message}\n\n")
         
-        # Add context if provided
+        # Add context if provided, written as-is to avoid copying it into an f-string
         if context:
-            parts.append(f"Context from documents:\n{context}\n")
+            prompt_builder.write("Context from documents:\n")
+            prompt_builder.write(context)
+            prompt_builder.write("\n\n")
         
         # Add user query
-        parts.append(f"User question: {prompt}\n")
-        parts.append("Assistant response:")
+        prompt_builder.write(f"User question: {prompt}\n\n")
+        prompt_builder.write("Assistant response:")
         
-        return "\n".join(parts)
+        return prompt_builder.getvalue()
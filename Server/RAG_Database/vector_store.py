@@ -1,16 +1,34 @@
 import os
+import io
+import mmap
 import hashlib
+import threading
 from typing import List, Dict, Optional
 from pathlib import Path
 
 import chromadb
 from chromadb.config import Settings
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
 from langchain_community.document_loaders import PyPDFLoader, TextLoader
 
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-from config import VECTOR_DB_PATH, CHUNK_SIZE, CHUNK_OVERLAP, TOP_K_RESULTS
+from config import (
+    VECTOR_DB_PATH, CHUNK_SIZE, CHUNK_OVERLAP, TOP_K_RESULTS, EMBEDDING_MODEL, EMBEDDING_DEVICE,
+    DOC_HASHES_PATH, RAW_HASHES_PATH
+)
+
+# ChromaDB collection holding every document chunk
+COLLECTION_NAME = "documents"
+
+# Number of metadata rows pulled per page when rebuilding document hashes
+HASH_LOAD_BATCH_SIZE = 10000
+
+# SHA-256 digest size, each hash sidecar file is a concatenation of these
+HASH_SIZE = 32
+
+# Chunk boundaries in order of preference: paragraph, line, word
+SPLIT_SEPARATORS = ("\n\n", "\n", " ")
 
 
 class VectorStore:
@@ -28,37 +46,177 @@ class VectorStore:
             settings=Settings(anonymized_telemetry=False)
         )
         
-        # Get or create collection
-        self.collection = self.client.get_or_create_collection(
-            name="documents",
-            metadata={"hnsw:space": "cosine"}
+        # Local embedder, batches documents and can run on the GPU
+        self.embedding_function = SentenceTransformerEmbeddingFunction(
+            model_name=EMBEDDING_MODEL,
+            device=EMBEDDING_DEVICE
         )
         
-        # Text splitter for chunking documents
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=CHUNK_SIZE,
-            chunk_overlap=CHUNK_OVERLAP,
-            length_function=len,
-        )
+        # Get or create collection
+        self.collection = self._open_collection()
+        
+        # Chunk count kept in step with our own adds, saves a COUNT(*) per query
+        self.chunk_count = self.collection.count()
+        
+        # Store document hashes (extracted text and raw file bytes) to prevent duplicates
+        # Kept in memory as raw 32-byte digests, stored in metadata as hex
+        self.document_hashes, self.raw_hashes = self._load_document_hashes()
+        
+        # Content hashes of documents whose collection.add is still running
+        self.pending_hashes = set()
+        
+        # Guards the hash sets and sidecar files when documents are added from several threads
+        self.hash_lock = threading.Lock()
+    
+    def _open_collection(self):
+        """
+        Open the documents collection, creating it with the local embedder and HNSW settings if missing
+        chromadb >= 1.0 stores the embedder with the collection, so older collections keep theirs
+        """
+        names = {getattr(c, "name", c) for c in self.client.list_collections()}
+        if COLLECTION_NAME not in names:
+            return self.client.create_collection(
+                name=COLLECTION_NAME,
+                metadata={
+                    "hnsw:space": "cosine",
+                    "hnsw:M": 32,
+                    "hnsw:construction_ef": 200,
+                    "hnsw:search_ef": 50
+                },
+                embedding_function=self.embedding_function
+            )
         
-        # Store document hashes to prevent duplicates
-        self.document_hashes = self._load_document_hashes()
+        try:
+            return self.client.get_collection(name=COLLECTION_NAME, embedding_function=self.embedding_function)
+        except ValueError as e:
+            # Collection was created with ChromaDB's default embedder, keep using it
+            print(f"Keeping the collection's stored embedding function: {e}")
+            print(f"To switch to the local SentenceTransformer embedder, delete {VECTOR_DB_PATH} and re-upload your documents")
+            return self.client.get_collection(name=COLLECTION_NAME)
     
     def _load_document_hashes(self):
-        """Load existing document hashes from metadata"""
-        hashes = set()
+        """
+        Load existing document and raw file hashes from the on-disk sidecar files
+        Falls back to scanning collection metadata (and rewriting the sidecars) if they are missing
+        """
+        if os.path.exists(DOC_HASHES_PATH) and os.path.exists(RAW_HASHES_PATH):
+            try:
+                return self._read_hash_file(DOC_HASHES_PATH), self._read_hash_file(RAW_HASHES_PATH)
+            except Exception as e:
+                print(f"Error reading document hash files, rebuilding: {e}")
+        
         try:
-            results = self.collection.get(include=["metadatas"])
-            for metadata in results.get("metadatas", []):
-                if metadata and "doc_hash" in metadata:
-                    hashes.add(metadata["doc_hash"])
+            hashes, raw_hashes = self._scan_document_hashes()
         except Exception as e:
             print(f"Error loading document hashes: {e}")
-        return hashes
+            return set(), set()
+        
+        try:
+            self._write_hash_file(DOC_HASHES_PATH, hashes)
+            self._write_hash_file(RAW_HASHES_PATH, raw_hashes)
+        except Exception as e:
+            print(f"Error writing document hash files: {e}")
+        return hashes, raw_hashes
+    
+    def _scan_document_hashes(self):
+        """Collect document and raw file hashes from collection metadata, a page at a time"""
+        hashes = set()
+        raw_hashes = set()
+        offset = 0
+        while True:
+            results = self.collection.get(
+                include=["metadatas"],
+                limit=HASH_LOAD_BATCH_SIZE,
+                offset=offset
+            )
+            metadatas = results.get("metadatas") or []
+            for metadata in metadatas:
+                if metadata and "doc_hash" in metadata:
+                    hashes.add(bytes.fromhex(metadata["doc_hash"]))
+                if metadata and "raw_hash" in metadata:
+                    raw_hashes.add(bytes.fromhex(metadata["raw_hash"]))
+            if len(metadatas) < HASH_LOAD_BATCH_SIZE:
+                break
+            offset += HASH_LOAD_BATCH_SIZE
+        return hashes, raw_hashes
+    
+    def _read_hash_file(self, path: str):
+        """Read a sidecar file of concatenated digests into a set"""
+        size = os.path.getsize(path)
+        
+        # Cut off a trailing partial record from an interrupted append, so later appends stay aligned
+        if size % HASH_SIZE:
+            size -= size % HASH_SIZE
+            os.truncate(path, size)
+        
+        if size == 0:
+            return set()
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as data:
+            return {data[i:i + HASH_SIZE] for i in range(0, size, HASH_SIZE)}
+    
+    def _write_hash_file(self, path: str, hashes: set):
+        """Rewrite a sidecar file from a set of digests"""
+        with open(path, 'wb') as f:
+            f.write(b"".join(hashes))
+    
+    def _append_hash(self, path: str, digest: bytes):
+        """Append one digest to a sidecar file"""
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, digest)
+        finally:
+            os.close(fd)
     
     def _hash_content(self, content: str):
-        """Generate SHA-256 hash of content"""
-        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+        """Generate SHA-256 digest of content"""
+        return hashlib.sha256(content.encode('utf-8')).digest()
+    
+    def _hash_file(self, file_path: str):
+        """Generate SHA-256 digest of the raw file bytes without loading it whole"""
+        with open(file_path, 'rb') as f:
+            if hasattr(hashlib, "file_digest"):  # Python 3.11+
+                return hashlib.file_digest(f, "sha256").digest()
+            digest = hashlib.sha256()
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+            return digest.digest()
+    
+    def _split_text(self, text: str):
+        """
+        Split text into chunks of at most CHUNK_SIZE characters overlapping by about CHUNK_OVERLAP
+        Scans forward once, using bounded rfind to land each cut on the nicest nearby separator
+        """
+        chunks = []
+        start = 0
+        length = len(text)
+        
+        while start < length:
+            end = min(start + CHUNK_SIZE, length)
+            
+            # Cut at the latest separator in the back half of the window
+            if end < length:
+                floor = start + CHUNK_SIZE // 2
+                for sep in SPLIT_SEPARATORS:
+                    cut = text.rfind(sep, floor, end)
+                    if cut != -1:
+                        end = cut + len(sep)
+                        break
+            
+            chunk = text[start:end].strip()
+            if chunk:
+                chunks.append(chunk)
+            
+            if end >= length:
+                break
+            
+            # Step back for overlap, snapping forward to the start of a word
+            next_start = max(end - CHUNK_OVERLAP, start + 1)
+            space = text.find(" ", next_start, end)
+            if space != -1:
+                next_start = space + 1
+            start = next_start
+        
+        return chunks
     
     def is_duplicate(self, content: str) -> bool:
         """Check if document content already exists in database"""
@@ -80,42 +238,74 @@ class VectorStore:
             else:
                 return {"status": "error", "message": f"Unsupported file type: {file_extension}"}
             
-            # Load and extract text
-            documents = loader.load()
-            full_content = "\n".join([doc.page_content for doc in documents])
-            
-            # Check for duplicates
-            doc_hash = self._hash_content(full_content)
-            if doc_hash in self.document_hashes:
+            # Check raw bytes for duplicates before paying for text extraction
+            raw_hash = self._hash_file(file_path)
+            if raw_hash in self.raw_hashes:
                 return {"status": "duplicate", "message": f"Document '{filename}' already exists in database"}
             
-            # Split into chunks
-            chunks = self.text_splitter.split_text(full_content)
+            # Load and extract text, streaming pages into one buffer
+            buf = io.StringIO()
+            for i, doc in enumerate(loader.lazy_load()):
+                if i:
+                    buf.write("\n")
+                buf.write(doc.page_content)
+            full_content = buf.getvalue()
             
-            if not chunks:
-                return {"status": "error", "message": "No content extracted from document"}
+            # Check for duplicates, reserving the hash so a concurrent upload of the same text is caught
+            doc_hash = self._hash_content(full_content)
+            with self.hash_lock:
+                if doc_hash in self.document_hashes:
+                    self.raw_hashes.add(raw_hash)
+                    return {"status": "duplicate", "message": f"Document '{filename}' already exists in database"}
+                if doc_hash in self.pending_hashes:
+                    return {"status": "in_progress", "message": f"Document '{filename}' is already being added"}
+                self.pending_hashes.add(doc_hash)
             
-            # Prepare data for ChromaDB
-            chunk_ids = [f"{doc_hash}_{i}" for i in range(len(chunks))]
-            metadatas = [
-                {
+            try:
+                # Split into chunks
+                chunks = self._split_text(full_content)
+                
+                if not chunks:
+                    with self.hash_lock:
+                        self.pending_hashes.discard(doc_hash)
+                    return {"status": "error", "message": "No content extracted from document"}
+                
+                # Prepare data for ChromaDB
+                doc_hash_hex = doc_hash.hex()
+                raw_hash_hex = raw_hash.hex()
+                chunk_ids = [f"{doc_hash_hex}_{i}" for i in range(len(chunks))]
+                
+                # Only chunk_index varies per chunk, build the rest once
+                common_metadata = {
                     "filename": filename,
-                    "doc_hash": doc_hash,
-                    "chunk_index": i,
+                    "doc_hash": doc_hash_hex,
+                    "raw_hash": raw_hash_hex,
                     "total_chunks": len(chunks)
                 }
-                for i in range(len(chunks))
-            ]
-            
-            # Add to collection
-            self.collection.add(
-                documents=chunks,
-                ids=chunk_ids,
-                metadatas=metadatas
-            )
+                metadatas = [{**common_metadata, "chunk_index": i} for i in range(len(chunks))]
+                
+                # Add to collection
+                self.collection.add(
+                    documents=chunks,
+                    ids=chunk_ids,
+                    metadatas=metadatas
+                )
+            except Exception:
+                with self.hash_lock:
+                    self.pending_hashes.discard(doc_hash)
+                raise
             
-            # Update hash set
-            self.document_hashes.add(doc_hash)
+            # Commit the reserved hash, then update chunk count, raw hash set and the sidecar files
+            with self.hash_lock:
+                self.pending_hashes.discard(doc_hash)
+                self.document_hashes.add(doc_hash)
+                self.chunk_count += len(chunks)
+                self.raw_hashes.add(raw_hash)
+                try:
+                    self._append_hash(DOC_HASHES_PATH, doc_hash)
+                    self._append_hash(RAW_HASHES_PATH, raw_hash)
+                except Exception as e:
+                    print(f"Error saving document hashes: {e}")
             
             return {
                 "status": "success",
@@ -132,13 +322,14 @@ class VectorStore:
         """
         try:
             # Check if collection is empty
-            if self.collection.count() == 0:
+            count = self.chunk_count
+            if count == 0:
                 return []
             
             # Query ChromaDB
             results = self.collection.query(
                 query_texts=[query_text],
-                n_results=min(n_results, self.collection.count()),
+                n_results=min(n_results, count),
                 include=["documents", "metadatas", "distances"]
             )
             
@@ -165,7 +356,7 @@ class VectorStore:
     def get_stats(self):
         """Get statistics about the vector store"""
         try:
-            count = self.collection.count()
+            count = self.chunk_count
             unique_docs = len(self.document_hashes)
             
             return {
@@ -1,9 +1,11 @@
 import hashlib
+import hmac
 from config import PASSWORD
 
 
 def verify_password(provided_password: str):
-    return provided_password == PASSWORD
+    # Constant-time comparison so response timing doesn't leak how much of the password matched
+    return hmac.compare_digest(provided_password.encode('utf-8'), PASSWORD.encode('utf-8'))
 
 
 def hash_document(content: str):
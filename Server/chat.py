@@ -4,12 +4,19 @@ Coordinates RAG retrieval and LLM generation
 """
 
 import os
-from typing import Dict, List, Optional, AsyncGenerator
+import io
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Deque, Dict, List, Optional, AsyncGenerator
 from datetime import datetime
 
 from RAG_Database.vector_store import VectorStore
 from LLM.llm_handler import LLMHandler
-from config import TOP_K_RESULTS
+from config import (
+    TOP_K_RESULTS, LLM_CHUNK_FLUSH_BYTES, LLM_CHUNK_FLUSH_SECONDS, MAX_CHAT_HISTORY, DOCUMENT_WORKERS
+)
 
 
 class ChatOrchestrator:
@@ -21,7 +28,14 @@ class ChatOrchestrator:
         """Initialize vector store and LLM handler"""
         self.vector_store = VectorStore()
         self.llm = LLMHandler()
-        self.chat_history: List[Dict[str, str]] = []
+        # Blocking work (document parsing, embedding, vector search) runs here, off the event loop
+        self.executor = ThreadPoolExecutor(max_workers=DOCUMENT_WORKERS)
+        # Ring buffer, oldest messages drop off once MAX_CHAT_HISTORY is reached
+        self.chat_history: Deque[Dict[str, str]] = deque(maxlen=MAX_CHAT_HISTORY)
+    
+    async def run_blocking(self, fn, *args):
+        """Run a blocking call on the worker threads so other websocket clients keep being served"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
         
     def add_message_to_history(self, role: str, content: str):
         """Add message to chat history"""
@@ -39,7 +53,7 @@ class ChatOrchestrator:
         if not self.chat_history:
             return ""
         
-        recent = self.chat_history[-last_n:]
+        recent = islice(self.chat_history, max(0, len(self.chat_history) - last_n), None)
         history_str = "\nRecent conversation:\n"
         for msg in recent:
             history_str += f"{msg['role']}: {msg['content']}\n"
@@ -57,39 +71,51 @@ class ChatOrchestrator:
         
         Arguement of function:
             query: User's question
-            document_paths: Optional list of document paths to add to RAG
-            document_filenames: Optional list of original filenames
+            document_paths: Optional list of document paths to add to RAG (may be empty)
+            document_filenames: Optional list of original filenames (may be empty)
             use_rag: Whether to use RAG for context retrieval
             
         Rerturns to me:
             Dictionaries with response chunks and metadata
         """
-        # Step 1: Process any attached documents
+        # Step 1: Process any attached documents, all at once on the worker threads
         if document_paths:
+            tasks = []
             for i, doc_path in enumerate(document_paths):
                 # Use original filename if provided, otherwise extract from path
                 filename = document_filenames[i] if document_filenames and i < len(document_filenames) else os.path.basename(doc_path)
-                result = self.vector_store.add_document(doc_path, filename)
+                tasks.append(self.run_blocking(self.vector_store.add_document, doc_path, filename))
+            
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    result = {"status": "error", "message": f"Error processing document: {str(result)}"}
                 yield {
                     "type": "document_status",
                     "data": result
                 }
         
-        # Step 2: Retrieve context from RAG if enabled
-        context = ""
+        # Step 2: Build context in one buffer, chat history first then RAG results
+        has_query = bool(query and query.strip())
+        context_builder = io.StringIO()
         retrieved_docs = []
         
+        if has_query:
+            history_context = self.get_chat_history(last_n=3)
+            if history_context:
+                context_builder.write(history_context)
+                context_builder.write("\n\n")
+        
         if use_rag:
-            retrieved_docs = self.vector_store.query(query, n_results=TOP_K_RESULTS)
+            retrieved_docs = await self.run_blocking(self.vector_store.query, query, TOP_K_RESULTS)
             
             if retrieved_docs:
                 # Format context from retrieved documents
-                context_parts = []
                 for i, doc in enumerate(retrieved_docs, 1):
-                    context_parts.append(
-                        f"[Source {i}: {doc['filename']}]\n{doc['content']}"
-                    )
-                context = "\n\n".join(context_parts)
+                    if i > 1:
+                        context_builder.write("\n\n")
+                    context_builder.write(f"[Source {i}: {doc['filename']}]\n")
+                    context_builder.write(doc['content'])
                 
                 # Send retrieval info to client
                 yield {
@@ -101,7 +127,7 @@ class ChatOrchestrator:
                 }
         
         # Step 3: Only query LLM if there's an actual query
-        if query and query.strip():
+        if has_query:
             # Build system message
             system_message = (
                 "You are a helpful AI record keeper. "
@@ -109,20 +135,34 @@ class ChatOrchestrator:
                 "If the context doesn't contain relevant information, say so and do not make up answers."
             )
             
-            # Add chat history for context
-            history_context = self.get_chat_history(last_n=3)
-            if history_context:
-                context = history_context + "\n\n" + context
+            context = context_builder.getvalue()
             
             # Step 4: Generate response from LLM (streaming)
             yield {"type": "llm_start"}
             
+            # Coalesce tokens so each websocket frame carries more than a few bytes
+            loop = asyncio.get_running_loop()
             full_response = ""
+            buf = []
+            buf_bytes = 0
+            last_flush = loop.time()
             async for chunk in self.llm.generate(query, context, system_message):
                 full_response += chunk
+                buf.append(chunk)
+                buf_bytes += len(chunk)
+                if buf_bytes >= LLM_CHUNK_FLUSH_BYTES or loop.time() - last_flush > LLM_CHUNK_FLUSH_SECONDS:
+                    yield {
+                        "type": "llm_chunk",
+                        "data": "".join(buf)
+                    }
+                    buf = []
+                    buf_bytes = 0
+                    last_flush = loop.time()
+            
+            if buf:
                 yield {
                     "type": "llm_chunk",
-                    "data": chunk
+                    "data": "".join(buf)
                 }
             
             # Step 5: Add to chat history
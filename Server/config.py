@@ -12,25 +12,36 @@ load_dotenv()
 SERVER_HOST = "0.0.0.0"  # Listen on all interfaces
 SERVER_PORT = 8765
 WEBSOCKET_PATH = "/ws"
+# Worker processes. The embedded ChromaDB database is only safe in one process, so the server refuses more than 1
+SERVER_WORKERS = int(os.getenv("WEB_CONCURRENCY", "1"))
 
 # Authentication
 PASSWORD = os.getenv("SERVER_PASSWORD", "changeme123")  # Set via .env file
+AUTH_MAX_FAILURES = 5  # Failed auth attempts allowed per client host..
+AUTH_WINDOW_SECONDS = 60  # ..within this many seconds
 
 # LLM Configuration
 LLM_MODEL = os.getenv("LLM_MODEL", "llama2")  # Ollama model name
 LLM_BASE_URL = os.getenv("LLM_BASE_URL", "http://localhost:11434")  # Ollama default
 LLM_TEMPERATURE = 0.7
 LLM_MAX_TOKENS = 2048
+LLM_CHUNK_FLUSH_BYTES = 256  # Batch streamed tokens until this many characters..
+LLM_CHUNK_FLUSH_SECONDS = 0.02  # ..or this long since the last send
 
 # RAG Configuration
 VECTOR_DB_PATH = os.path.join(os.path.dirname(__file__), "RAG_Database", "chroma_db")
+DOC_HASHES_PATH = os.path.join(VECTOR_DB_PATH, "doc_hashes.bin")  # Sidecar of known document hashes
+RAW_HASHES_PATH = os.path.join(VECTOR_DB_PATH, "raw_hashes.bin")  # Sidecar of known raw file hashes
 CHUNK_SIZE = 500
 CHUNK_OVERLAP = 50
 TOP_K_RESULTS = 3  # Number of similar documents to retrieve
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"  # Same model as ChromaDB's default; chromadb >= 1.0 collections keep the embedder they were created with
+EMBEDDING_DEVICE = os.getenv("EMBEDDING_DEVICE", "cpu")  # "cuda" to embed on the GPU
 
 # Document Configuration
-SUPPORTED_EXTENSIONS = [".pdf", ".txt"]
+SUPPORTED_EXTENSIONS = frozenset({".pdf", ".txt"})
 MAX_FILE_SIZE_MB = 50
+DOCUMENT_WORKERS = 4  # Attached documents processed in parallel
 
 # Chat Configuration
 MAX_CHAT_HISTORY = 100  # Maximum messages to keep in history
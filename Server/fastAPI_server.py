@@ -4,12 +4,26 @@ Provides real-time chat interface with RAG + LLM
 """
 
 import asyncio
-import json
+import binascii
+import logging
+import logging.handlers
 import os
+import queue
+import sys
 import tempfile
-import base64
-from typing import Dict, Optional
-from pathlib import Path
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, List, Optional, Tuple
+
+import msgspec
+import orjson
+
+# SIMD-accelerated base64 when available, stdlib otherwise
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.responses import JSONResponse
@@ -17,49 +31,317 @@ import uvicorn
 
 from authentication import verify_password, AuthenticationError
 from chat import ChatOrchestrator
-from config import SERVER_HOST, SERVER_PORT, SUPPORTED_EXTENSIONS, MAX_FILE_SIZE_MB
+from config import (
+    SERVER_HOST, SERVER_PORT, SERVER_WORKERS, SUPPORTED_EXTENSIONS, MAX_FILE_SIZE_MB,
+    AUTH_MAX_FAILURES, AUTH_WINDOW_SECONDS
+)
 
 
-# Initialize FastAPI app
-app = FastAPI(
-    title="VirtualRAG Server",
-    description="Real-time RAG-powered chatbot with document upload",
-    version="1.0.0"
+class InlineDocument(msgspec.Struct):
+    """Base64 document attached directly to a query message"""
+    filename: str = ""
+    content: str = ""
+
+
+class ClientMessage(msgspec.Struct):
+    """Any message a client sends as JSON, fields unused by its type keep their defaults"""
+    type: str = ""
+    password: str = ""
+    filename: str = ""
+    seq: int = 0
+    data: str = ""
+    query: str = ""
+    documents: List[InlineDocument] = []
+
+
+# Decodes JSON text straight into a ClientMessage, rejecting wrongly typed fields
+client_message_decoder = msgspec.json.Decoder(ClientMessage)
+
+# Fixed control messages, serialized once at import
+INVALID_JSON_BYTES = orjson.dumps({"type": "error", "message": "Invalid JSON format"})
+AUTH_SUCCESS_BYTES = orjson.dumps({"type": "auth_success", "message": "Authentication successful"})
+AUTH_FAILED_BYTES = orjson.dumps({"type": "auth_failed", "message": "Invalid password"})
+AUTH_RATE_LIMITED_BYTES = orjson.dumps({"type": "auth_failed", "message": "Too many failed attempts. Try again later."})
+NOT_AUTH_BYTES = orjson.dumps({"type": "error", "message": "Not authenticated. Send auth message first."})
+DISCONNECT_ACK_BYTES = orjson.dumps({"type": "disconnect_ack", "message": "Goodbye!"})
+EMPTY_QUERY_BYTES = orjson.dumps({"type": "error", "message": "Empty query"})
+
+# Largest websocket frame accepted: an inline base64 document at the size limit plus JSON overhead
+WS_MAX_SIZE = MAX_FILE_SIZE_MB * 1024 * 1024 * 4 // 3 + 1024 * 1024
+
+# Base64 characters decoded per step for inline documents, a multiple of 4 so steps decode independently
+B64_DECODE_CHUNK = 1024 * 1024
+
+# Deletes the whitespace line-wrapping encoders may add to base64 text
+B64_WHITESPACE_TABLE = str.maketrans("", "", "\r\n\t ")
+
+# Each worker would open its own embedded ChromaDB client on the same directory and overwrite the others' index files
+MULTI_WORKER_ERROR = (
+    f"WEB_CONCURRENCY={SERVER_WORKERS} is not supported: the ChromaDB database can only be used by one server process"
 )
 
-# Global chat orchestrator (one per server instance)
-chat_orchestrator = ChatOrchestrator()
+
+# Log records are queued here and written to stdout by a listener thread, keeping
+# terminal I/O off the event loop
+logger = logging.getLogger("virtualrag")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+log_queue = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def start_log_listener():
+    """Start the thread that writes queued log records (once per process)"""
+    global log_listener
+    if log_listener is None:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log_listener = logging.handlers.QueueListener(log_queue, handler)
+        log_listener.start()
+
+
+def stop_log_listener():
+    """Flush remaining log records and stop the listener thread"""
+    global log_listener
+    if log_listener is not None:
+        log_listener.stop()
+        log_listener = None
+
+
+# Global chat orchestrator (created when the app starts)
+chat_orchestrator: Optional[ChatOrchestrator] = None
 
 
 class ConnectionManager:
     """Manages WebSocket connections"""
     
     def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
+        # Keyed by (host, port), formatted as host:port only for log lines
+        self.active_connections: Dict[Tuple[str, int], WebSocket] = {}
+        # Recent failed auth times per host, so reconnecting on a new port doesn't reset them
+        self.failed_auth: Dict[str, Deque[float]] = {}
+    
+    def auth_allowed(self, host: str):
+        """Check whether a host is still under AUTH_MAX_FAILURES within AUTH_WINDOW_SECONDS"""
+        failures = self.failed_auth.get(host)
+        if not failures:
+            return True
+        cutoff = time.monotonic() - AUTH_WINDOW_SECONDS
+        while failures and failures[0] < cutoff:
+            failures.popleft()
+        if not failures:
+            del self.failed_auth[host]
+            return True
+        return len(failures) < AUTH_MAX_FAILURES
     
-    async def connect(self, websocket: WebSocket, client_id: str):
+    def record_auth_failure(self, host: str):
+        """Remember a failed auth attempt from a host"""
+        self.failed_auth.setdefault(host, deque()).append(time.monotonic())
+    
+    async def connect(self, websocket: WebSocket, client_id: Tuple[str, int]):
         """Accept and store WebSocket connection"""
         await websocket.accept()
         self.active_connections[client_id] = websocket
-        print(f"Client {client_id} connected. Total connections: {len(self.active_connections)}")
+        logger.info(f"Client {client_id[0]}:{client_id[1]} connected. Total connections: {len(self.active_connections)}")
     
-    def disconnect(self, client_id: str):
+    def disconnect(self, client_id: Tuple[str, int]):
         """Remove WebSocket connection"""
-        if client_id in self.active_connections:
-            del self.active_connections[client_id]
-            print(f"Client {client_id} disconnected. Total connections: {len(self.active_connections)}")
+        if self.active_connections.pop(client_id, None) is not None:
+            logger.info(f"Client {client_id[0]}:{client_id[1]} disconnected. Total connections: {len(self.active_connections)}")
     
     async def send_message(self, websocket: WebSocket, message: dict):
-        """Send JSON message to client"""
+        """Send JSON message to client as a binary frame, skipping the str round trip"""
         try:
-            await websocket.send_text(json.dumps(message))
+            await websocket.send_bytes(orjson.dumps(message))
         except Exception as e:
-            print(f"Error sending message: {e}")
+            logger.error(f"Error sending message: {e}")
+    
+    async def send_bytes(self, websocket: WebSocket, payload: bytes):
+        """Send an already serialized JSON message to client"""
+        try:
+            await websocket.send_bytes(payload)
+        except Exception as e:
+            logger.error(f"Error sending message: {e}")
 
 
 manager = ConnectionManager()
 
 
+def discard_upload(upload: dict):
+    """Close and remove the temp file of an unfinished streamed upload"""
+    try:
+        upload["file"].close()
+        os.unlink(upload["file"].name)
+    except:
+        pass
+
+
+def file_extension(filename: str):
+    """Lowercase extension including the dot ('' if none), without building a Path"""
+    dot = filename.rfind('.')
+    return filename[dot:].lower() if dot > 0 else ''
+
+
+def estimated_decoded_size(content_b64: str):
+    """Size in bytes that base64 content decodes to, from its length and padding alone"""
+    return ((len(content_b64) * 3) >> 2) - content_b64[-2:].count("=")
+
+
+def decode_b64(content_b64: str):
+    """
+    Strictly decode base64, stripping whitespace and retrying only if the fast path rejects it
+    Raises binascii.Error if the content is still invalid
+    """
+    try:
+        return base64.b64decode(content_b64, validate=True)
+    except binascii.Error:
+        return base64.b64decode(content_b64.translate(B64_WHITESPACE_TABLE), validate=True)
+
+
+def decode_to_file(content_b64: str, file, max_bytes: int):
+    """
+    Base64 decode content into an open file a chunk at a time
+    Returns the decoded size, or -1 as soon as it exceeds max_bytes
+    """
+    try:
+        return decode_chunks_to_file(content_b64, file, max_bytes)
+    except binascii.Error:
+        # Whitespace shifts chunk alignment, so strip it once and start over
+        file.seek(0)
+        file.truncate()
+        return decode_chunks_to_file(content_b64.translate(B64_WHITESPACE_TABLE), file, max_bytes)
+
+
+def decode_chunks_to_file(content_b64: str, file, max_bytes: int):
+    """Strictly decode clean base64 into a file in B64_DECODE_CHUNK steps, -1 if it exceeds max_bytes"""
+    size_bytes = 0
+    for start in range(0, len(content_b64), B64_DECODE_CHUNK):
+        decoded = base64.b64decode(content_b64[start:start + B64_DECODE_CHUNK], validate=True)
+        size_bytes += len(decoded)
+        if size_bytes > max_bytes:
+            return -1
+        file.write(decoded)
+    return size_bytes
+
+
+def stage_inline_document(doc: "InlineDocument"):
+    """
+    Validate an inline base64 document and decode it into a temp file
+    Returns {"path", "filename"} on success, {"error"} on failure, or None if the entry is empty
+    """
+    filename = doc.filename
+    content_b64 = doc.content
+    
+    if not filename or not content_b64:
+        return None
+    
+    # Validate file extension
+    file_ext = file_extension(filename)
+    if file_ext not in SUPPORTED_EXTENSIONS:
+        return {"error": f"Unsupported file type: {file_ext}"}
+    
+    # Reject on the estimated size before any decoding or temp file
+    estimated_mb = estimated_decoded_size(content_b64) / (1024 * 1024)
+    if estimated_mb > MAX_FILE_SIZE_MB:
+        return {"error": f"File too large: {filename} ({estimated_mb:.1f}MB > {MAX_FILE_SIZE_MB}MB)"}
+    
+    # Decode straight into a temp file, never holding the whole file in memory
+    try:
+        temp_file = tempfile.NamedTemporaryFile(
+            delete=False,
+            suffix=file_ext
+        )
+    except Exception as e:
+        return {"error": f"Error processing document {filename}: {str(e)}"}
+    
+    try:
+        size_bytes = decode_to_file(content_b64, temp_file, MAX_FILE_SIZE_MB * 1024 * 1024)
+        temp_file.close()
+        
+        # Check file size
+        if size_bytes < 0:
+            os.unlink(temp_file.name)
+            return {"error": f"File too large: {filename} (> {MAX_FILE_SIZE_MB}MB)"}
+        
+        return {"path": temp_file.name, "filename": filename}
+        
+    except Exception as e:
+        temp_file.close()
+        try:
+            os.unlink(temp_file.name)
+        except:
+            pass
+        return {"error": f"Error processing document {filename}: {str(e)}"}
+
+
+async def write_upload_chunk(websocket: WebSocket, upload: dict, content_bytes: bytes):
+    """
+    Append a chunk to a streamed upload, checking the file size as it grows
+    Returns False after notifying the client and discarding the upload if it fails
+    """
+    try:
+        upload["size"] += len(content_bytes)
+        
+        size_mb = upload["size"] / (1024 * 1024)
+        if size_mb > MAX_FILE_SIZE_MB:
+            await manager.send_message(websocket, {
+                "type": "error",
+                "message": f"File too large: {upload['filename']} (> {MAX_FILE_SIZE_MB}MB)"
+            })
+            discard_upload(upload)
+            return False
+        
+        # Disk write on a worker thread so a large chunk doesn't block the event loop
+        await asyncio.get_running_loop().run_in_executor(None, upload["file"].write, content_bytes)
+        return True
+        
+    except Exception as e:
+        await manager.send_message(websocket, {
+            "type": "error",
+            "message": f"Error processing document {upload['filename']}: {str(e)}"
+        })
+        discard_upload(upload)
+        return False
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the chat orchestrator and warm up ChromaDB, flush pending log records on shutdown"""
+    global chat_orchestrator
+    start_log_listener()
+    
+    # Also covers WEB_CONCURRENCY picked up by the uvicorn command line
+    if SERVER_WORKERS > 1:
+        raise RuntimeError(MULTI_WORKER_ERROR)
+    
+    chat_orchestrator = ChatOrchestrator()
+    
+    # Pre-initialize ChromaDB to download embedding model if needed
+    logger.info("\nInitializing RAG database...")
+    try:
+        chat_orchestrator.vector_store.query("test initialization", n_results=1)
+        
+        stats = chat_orchestrator.get_stats()
+        logger.info(f" Vector store ready: {stats['vector_store']['unique_documents']} documents loaded")
+        logger.info(f" LLM available: {stats['llm_available']}")
+    except Exception as e:
+        logger.warning(f" Warning during initialization: {e}")
+    
+    logger.info("\nServer ready! Press Ctrl+C to stop\n")
+    yield
+    stop_log_listener()
+
+
+# Initialize FastAPI app
+app = FastAPI(
+    title="VirtualRAG Server",
+    description="Real-time RAG-powered chatbot with document upload",
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -74,188 +356,256 @@ async def websocket_endpoint(websocket: WebSocket):
     """
     Main WebSocket endpoint for real-time chat
     
-    Message format from client:
+    Message format from client (JSON in text frames):
     {
-        "type": "auth|query|disconnect",
+        "type": "auth|doc_start|doc_chunk|doc_end|query|disconnect",
         "password": ".." (for auth),
+        "filename": ".." (for doc_start),
+        "seq": 0, "data": "base64.." (for doc_chunk),
         "query": ".." (for query),
         "documents": [{"filename": "..", "content": "base64.."}, ..] (optional)
     }
+    
+    Streamed documents (doc_start -> chunks.. -> doc_end) are staged to
+    temp files and attached to the next query. Chunks are raw bytes in
+    binary frames, or base64 doc_chunk messages from older clients
     """
-    client_id = f"{websocket.client.host}:{websocket.client.port}"
+    host = websocket.client.host
+    port = websocket.client.port
+    client_id = (host, port)
     authenticated = False
     
+    # Streamed upload in progress and completed uploads waiting for a query
+    upload: Optional[dict] = None
+    staged_paths = []
+    staged_filenames = []
+    
     await manager.connect(websocket, client_id)
     
     try:
         while True:
             # Receive message from client
-            data = await websocket.receive_text()
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+            
+            # Binary frames carry raw bytes of the document being streamed
+            content_bytes = frame.get("bytes")
+            if content_bytes is not None:
+                if upload and not await write_upload_chunk(websocket, upload, content_bytes):
+                    upload = None
+                continue
             
             try:
-                message = json.loads(data)
-            except json.JSONDecodeError:
-                await manager.send_message(websocket, {
-                    "type": "error",
-                    "message": "Invalid JSON format"
-                })
+                message = client_message_decoder.decode(frame.get("text") or "")
+            except msgspec.DecodeError:
+                await manager.send_bytes(websocket, INVALID_JSON_BYTES)
                 continue
             
-            msg_type = message.get("type")
+            msg_type = message.type
             
             # Handle authentication
             if msg_type == "auth":
-                password = message.get("password", "")
+                if not manager.auth_allowed(host):
+                    await manager.send_bytes(websocket, AUTH_RATE_LIMITED_BYTES)
+                    continue
+                
+                password = message.password
                 if verify_password(password):
-                    await manager.send_message(websocket, {
-                        "type": "auth_success",
-                        "message": "Authentication successful"
-                    })
+                    await manager.send_bytes(websocket, AUTH_SUCCESS_BYTES)
                     authenticated = True
                 else:
-                    await manager.send_message(websocket, {
-                        "type": "auth_failed",
-                        "message": "Invalid password"
-                    })
+                    manager.record_auth_failure(host)
+                    await manager.send_bytes(websocket, AUTH_FAILED_BYTES)
                 continue
             
             # Check if authenticated for other operations
             if not authenticated:
-                await manager.send_message(websocket, {
-                    "type": "error",
-                    "message": "Not authenticated. Send auth message first."
-                })
+                await manager.send_bytes(websocket, NOT_AUTH_BYTES)
                 continue
             
             # Handle disconnect
             if msg_type == "disconnect":
-                await manager.send_message(websocket, {
-                    "type": "disconnect_ack",
-                    "message": "Goodbye!"
-                })
+                await manager.send_bytes(websocket, DISCONNECT_ACK_BYTES)
                 break
             
-            # Handle query with/without document upload
-            if msg_type == "query":
-                query = message.get("query", "")
-                documents = message.get("documents", [])
+            # Handle start of a streamed document upload
+            if msg_type == "doc_start":
+                # Drop any upload the client abandoned mid-stream
+                if upload:
+                    discard_upload(upload)
+                    upload = None
                 
-                # Allow empty query if documents are being uploaded
-                if not query and not documents:
+                filename = message.filename
+                file_ext = file_extension(filename)
+                if not filename or file_ext not in SUPPORTED_EXTENSIONS:
                     await manager.send_message(websocket, {
                         "type": "error",
-                        "message": "Empty query"
+                        "message": f"Unsupported file type: {file_ext}"
                     })
                     continue
                 
-                # Process documents if attached
-                document_paths = []
-                document_filenames = []
+                upload = {
+                    "file": tempfile.NamedTemporaryFile(delete=False, suffix=file_ext),
+                    "filename": filename,
+                    "size": 0
+                }
+                continue
+            
+            # Handle a base64 chunk of the document being streamed (older clients)
+            if msg_type == "doc_chunk":
+                if not upload:
+                    continue
                 
-                for doc in documents:
-                    filename = doc.get("filename", "")
-                    content_b64 = doc.get("content", "")
-                    
-                    if not filename or not content_b64:
-                        continue
+                try:
+                    content_b64 = message.data
                     
-                    # Validate file extension
-                    file_ext = Path(filename).suffix.lower()
-                    if file_ext not in SUPPORTED_EXTENSIONS:
+                    # Reject on the estimated size before spending time decoding
+                    if upload["size"] + estimated_decoded_size(content_b64) > MAX_FILE_SIZE_MB * 1024 * 1024:
                         await manager.send_message(websocket, {
                             "type": "error",
-                            "message": f"Unsupported file type: {file_ext}"
+                            "message": f"File too large: {upload['filename']} (> {MAX_FILE_SIZE_MB}MB)"
                         })
+                        discard_upload(upload)
+                        upload = None
                         continue
                     
-                    # Decode and save to temp file
-                    try:
-                        content_bytes = base64.b64decode(content_b64)
+                    content_bytes = decode_b64(content_b64)
+                    if not await write_upload_chunk(websocket, upload, content_bytes):
+                        upload = None
+                    
+                except Exception as e:
+                    await manager.send_message(websocket, {
+                        "type": "error",
+                        "message": f"Error processing document {upload['filename']}: {str(e)}"
+                    })
+                    discard_upload(upload)
+                    upload = None
+                continue
+            
+            # Handle end of a streamed document, staging it for the next query
+            if msg_type == "doc_end":
+                if upload:
+                    upload["file"].close()
+                    staged_paths.append(upload["file"].name)
+                    staged_filenames.append(upload["filename"])
+                    upload = None
+                continue
+            
+            # Handle query with/without document upload
+            if msg_type == "query":
+                query = message.query
+                documents = message.documents
+                
+                # Take ownership of streamed documents staged for this query
+                document_paths = staged_paths
+                document_filenames = staged_filenames
+                staged_paths = []
+                staged_filenames = []
+                
+                # Allow empty query if documents are being uploaded
+                if not query and not documents and not document_paths:
+                    await manager.send_bytes(websocket, EMPTY_QUERY_BYTES)
+                    continue
+                
+                # Temp files staged for this query are removed however it ends
+                try:
+                    # Process inline documents if attached, decoding them in parallel on worker threads
+                    if documents:
+                        loop = asyncio.get_running_loop()
+                        results = await asyncio.gather(*(
+                            loop.run_in_executor(None, stage_inline_document, doc) for doc in documents
+                        ), return_exceptions=True)
                         
-                        # Check file size
-                        size_mb = len(content_bytes) / (1024 * 1024)
-                        if size_mb > MAX_FILE_SIZE_MB:
+                        errors = []
+                        for doc, result in zip(documents, results):
+                            if isinstance(result, Exception):
+                                errors.append(f"Error processing document {doc.filename}: {str(result)}")
+                                continue
+                            if not result:
+                                continue
+                            if "error" in result:
+                                errors.append(result["error"])
+                            else:
+                                document_paths.append(result["path"])
+                                document_filenames.append(result["filename"])
+                        
+                        if errors:
                             await manager.send_message(websocket, {
                                 "type": "error",
-                                "message": f"File too large: {filename} ({size_mb:.1f}MB > {MAX_FILE_SIZE_MB}MB)"
+                                "message": "\n".join(errors)
                             })
-                            continue
-                        
-                        # Save to temp file
-                        temp_file = tempfile.NamedTemporaryFile(
-                            delete=False,
-                            suffix=file_ext
-                        )
-                        temp_file.write(content_bytes)
-                        temp_file.close()
-                        
-                        document_paths.append(temp_file.name)
-                        document_filenames.append(filename)
+                    
+                    # Process query through RAG + LLM pipeline
+                    try:
+                        async for response in chat_orchestrator.process_query(
+                            query=query,
+                            document_paths=document_paths,
+                            document_filenames=document_filenames,
+                            use_rag=True
+                        ):
+                            await manager.send_message(websocket, response)
                         
                     except Exception as e:
                         await manager.send_message(websocket, {
                             "type": "error",
-                            "message": f"Error processing document {filename}: {str(e)}"
+                            "message": f"Error processing query: {str(e)}"
                         })
-                        continue
-                
-                # Process query through RAG + LLM pipeline
-                try:
-                    async for response in chat_orchestrator.process_query(
-                        query=query,
-                        document_paths=document_paths if document_paths else None,
-                        document_filenames=document_filenames if document_filenames else None,
-                        use_rag=True
-                    ):
-                        await manager.send_message(websocket, response)
                     
-                except Exception as e:
-                    await manager.send_message(websocket, {
-                        "type": "error",
-                        "message": f"Error processing query: {str(e)}"
-                    })
-                
-                # Clean up temp files
-                for temp_path in document_paths:
-                    try:
-                        os.unlink(temp_path)
-                    except:
-                        pass
+                finally:
+                    # Clean up temp files
+                    for temp_path in document_paths:
+                        try:
+                            os.unlink(temp_path)
+                        except:
+                            pass
     
     except WebSocketDisconnect:
-        print(f"Client {client_id} disconnected (WebSocket closed)")
+        logger.info(f"Client {host}:{port} disconnected (WebSocket closed)")
     except Exception as e:
-        print(f"Error in WebSocket for {client_id}: {e}")
+        logger.error(f"Error in WebSocket for {host}:{port}: {e}")
     finally:
+        # Clean up uploads that never reached a query
+        if upload:
+            discard_upload(upload)
+        for temp_path in staged_paths:
+            try:
+                os.unlink(temp_path)
+            except:
+                pass
         manager.disconnect(client_id)
 
 
 def main():
     """Start the FastAPI server"""
-    print(f"Starting VirtualRAG Server on {SERVER_HOST}:{SERVER_PORT}")
-    print(f"WebSocket endpoint: ws://{SERVER_HOST}:{SERVER_PORT}/ws")
-    print(f"Health check: http://{SERVER_HOST}:{SERVER_PORT}/")
+    start_log_listener()
     
-    # Pre-initialize ChromaDB to download embedding model if needed
-    print("\nInitializing RAG database...")
-    try:
-        chat_orchestrator.vector_store.query("test initialization", n_results=1)
-        
-        stats = chat_orchestrator.get_stats()
-        print(f" Vector store ready: {stats['vector_store']['unique_documents']} documents loaded")
-        print(f" LLM available: {stats['llm_available']}")
-    except Exception as e:
-        print(f" Warning during initialization: {e}")
+    logger.info(f"Starting VirtualRAG Server on {SERVER_HOST}:{SERVER_PORT}")
+    logger.info(f"WebSocket endpoint: ws://{SERVER_HOST}:{SERVER_PORT}/ws")
+    logger.info(f"Health check: http://{SERVER_HOST}:{SERVER_PORT}/")
+    
+    # Confirm which base64 implementation handles uploads
+    if hasattr(base64, "get_version"):
+        logger.info(f"Base64 decoder: pybase64 {base64.get_version()}")
+    else:
+        logger.info("Base64 decoder: stdlib (install pybase64 for SIMD decoding)")
     
-    print("\nServer ready! Press Ctrl+C to stop\n")
+    if SERVER_WORKERS > 1:
+        logger.error(MULTI_WORKER_ERROR)
+        stop_log_listener()
+        sys.exit(1)
     
+    # loop and http stay on "auto", which picks uvloop and httptools when installed (uvicorn[standard])
     uvicorn.run(
         app,
         host=SERVER_HOST,
         port=SERVER_PORT,
+        ws_max_size=WS_MAX_SIZE,
+        ws_per_message_deflate=False,
         log_level="info",
         timeout_keep_alive=120 
     )
+    stop_log_listener()
 
 
 if __name__ == "__main__":
@@ -1,32 +1,22 @@
+import os
+import sys
 
-import chromadb
-from chromadb.config import Settings
+from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
 
-# Initialize ChromaDB (this will download the model)
-print("Initializing ChromaDB and downloading embedding model...")
-client = chromadb.PersistentClient(
-    path="Server/RAG_Database/chroma_db",
-    settings=Settings(anonymized_telemetry=False)
-)
+# Use the same embedding settings as the server
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Server"))
+from config import EMBEDDING_MODEL, EMBEDDING_DEVICE
 
-# Create/get collection
-collection = client.get_or_create_collection(
-    name="documents",
-    metadata={"hnsw:space": "cosine"}
+# Load the embedding function (this will download the model)
+print("Initializing embedding function and downloading embedding model...")
+embedding_function = SentenceTransformerEmbeddingFunction(
+    model_name=EMBEDDING_MODEL,
+    device=EMBEDDING_DEVICE
 )
 
-# Trigger embedding model download by adding a test document
-print("Triggering embedding model download...")
-collection.add(
-    documents=["This is a test document to download the embedding model."],
-    ids=["test_init"],
-    metadatas=[{"source": "initialization"}]
-)
+# Embed a warm-up string directly, nothing is written to the vector database
+print("Warming up embedding model...")
+embedding_function(["warmup"])
 
 print("✓ Embedding model downloaded and cached!")
-print(f"Model location: C:\\Users\\Jonah\\.cache\\chroma\\onnx_models\\")
-
-# Clean up test document
-collection.delete(ids=["test_init"])
-print("✓ Test document removed")
-print("\nNow your server should start instantly without timeouts!")
\ No newline at end of file
+print("\nNow your server should start instantly without timeouts!")